@@ -0,0 +1,107 @@
+# cython: language_level=3
+# distutils: extra_compile_args = -O3 -march=native -ffast-math -fopenmp
+# distutils: extra_link_args = -fopenmp
+"""
+Ahead-of-time compiled escape time kernels, used by mandelbrot.py when built with:
+    cythonize -i mandel_kernel.pyx
+"""
+cimport cython
+from cython.parallel import prange
+
+ctypedef fused real_t: #float32 or float64 iteration, chosen by the dtype of the grid
+    float
+    double
+
+ctypedef fused escape_t: #matches the escape time dtype chosen by mandelbrot.py
+    unsigned short
+    int
+    long long
+
+cdef enum:
+    _PERIOD_CHECK_INTERVAL = 20 #same cycle detection as '_iterate_point' in mandelbrot.py
+
+
+cdef inline bint _in_cardioid_or_bulb(double cr, double ci) noexcept nogil:
+    """
+    Return whether c = cr + i*ci is inside the main cardioid or the period-2 bulb, which never escape
+    """
+    cdef double shifted = cr - 0.25
+    cdef double ci2 = ci * ci
+    cdef double q = shifted * shifted + ci2
+    return q * (q + shifted) < 0.25 * ci2 or (cr + 1.0) * (cr + 1.0) + ci2 < 0.0625
+
+
+@cython.cdivision(True)
+cdef inline long long _iterate_point(real_t zr, real_t zi, real_t c_real, real_t c_imag, long long max_it) noexcept nogil:
+    """
+    Return escape time of z = zr + i*zi under z^2 + c (max_it + 1 if it never escapes), same as in mandelbrot.py
+    """
+    cdef long long k
+    cdef real_t zr2, zi2, zr_ref, zi_ref
+    if zr == 0 and zi == 0 and _in_cardioid_or_bulb(c_real, c_imag): #orbit of 0 is known to never escape
+        return max_it + 1
+    zr2 = zr * zr
+    zi2 = zi * zi
+    zr_ref = zr #earlier point of the orbit, replaced by z_1 before it is first compared
+    zi_ref = zi
+    for k in range(max_it + 1):
+        zi = (zr + zr) * zi + c_imag
+        zr = zr2 - zi2 + c_real
+        zr2 = zr * zr
+        zi2 = zi * zi
+        if zr2 + zi2 > 4.0: #|z|^2 > 4
+            return k
+        if k % _PERIOD_CHECK_INTERVAL == 0:
+            zr_ref = zr
+            zi_ref = zi
+        elif zr == zr_ref and zi == zi_ref: #back at the reference point, the orbit repeats forever
+            return max_it + 1
+    return max_it + 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef void mandelbrot(const real_t[:, ::1] cr, const real_t[:, ::1] ci, long long max_it, escape_t[:, ::1] out):
+    """
+    Write the escape time of every c = cr + i*ci into out (max_it + 1 if it never escapes)
+
+    :param cr: 2D float array of real parts
+    :param ci: 2D float array of imaginary parts
+    :param max_it: int
+    :param out: 2D uint16, int32 or int64 array, same shape as cr
+    """
+    cdef Py_ssize_t height = cr.shape[0]
+    cdef Py_ssize_t width = cr.shape[1]
+    cdef Py_ssize_t row, col
+    cdef real_t zero = 0.0
+
+    with nogil:
+        for row in prange(height, schedule="dynamic"): #rows are independent, one strip per thread
+            for col in range(width):
+                out[row, col] = _iterate_point(zero, zero, cr[row, col], ci[row, col], max_it)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef void julia(const real_t[:, ::1] zr0, const real_t[:, ::1] zi0, real_t c_real, real_t c_imag, long long max_it,
+                 escape_t[:, ::1] out):
+    """
+    Write the escape time of every starting point z = zr0 + i*zi0 under z^2 + c into out
+
+    :param zr0: 2D float array of real parts
+    :param zi0: 2D float array of imaginary parts
+    :param c_real: float
+    :param c_imag: float
+    :param max_it: int
+    :param out: 2D uint16, int32 or int64 array, same shape as zr0
+    """
+    cdef Py_ssize_t height = zr0.shape[0]
+    cdef Py_ssize_t width = zr0.shape[1]
+    cdef Py_ssize_t row, col
+
+    with nogil:
+        for row in prange(height, schedule="dynamic"):
+            for col in range(width):
+                out[row, col] = _iterate_point(zr0[row, col], zi0[row, col], c_real, c_imag, max_it)
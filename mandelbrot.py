@@ -1,5 +1,107 @@
+import math
+
 import numpy as np
 
+try:
+    from numba import guvectorize, njit
+    _HAS_NUMBA = True
+except ImportError: #numba is optional, fall back to the NumPy implementation
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+    guvectorize = njit
+
+try:
+    from numba import cuda
+    _HAS_CUDA = cuda.is_available()
+except ImportError: #no GPU support without numba
+    _HAS_CUDA = False
+
+try:
+    import mandel_kernel #Cython kernels, only available once built with 'cythonize -i mandel_kernel.pyx'
+    _HAS_CYTHON_KERNEL = True
+except ImportError:
+    _HAS_CYTHON_KERNEL = False
+
+_ACTIVE_CHECK_INTERVAL = 8 #iterations between checks for points that haven't escaped
+_COMPACT_FRACTION = 0.75 #shrink the working arrays whenever a quarter of the tracked points have escaped
+#points per tile of the NumPy loop, picked by benchmark: 64K beat 16K-256K tiles and no tiling on 1000x1000 grids,
+#even though the tile's working arrays (~77 bytes per point, ~4.8 MiB) are larger than L2
+_TILE_SIZE = 256 * 256
+_PERIOD_CHECK_INTERVAL = 20 #iterations between updates of the reference point for cycle detection
+_CUDA_MIN_PIXELS = 1_000_000 #grids smaller than this aren't worth copying to the GPU
+_CUDA_BLOCK = 16 #threads per block along each axis
+
+
+def _cardioid_or_bulb_test(cr, ci):
+    """
+    Return whether c = cr + i*ci is inside the main cardioid or the period-2 bulb, which never escape
+    Plain Python, compiled below for the CPU as '_in_cardioid_or_bulb' and for the GPU when CUDA is available
+
+    :param cr: float or float array
+    :param ci: float or float array
+    :return: bool or bool array
+    """
+    shifted = cr - 0.25
+    ci2 = ci * ci
+    q = shifted * shifted + ci2
+    in_cardioid = q * (q + shifted) < 0.25 * ci2
+    in_bulb = (cr + 1.0) * (cr + 1.0) + ci2 < 0.0625 #disk of radius 1/4 around -1
+    return in_cardioid | in_bulb
+
+
+_in_cardioid_or_bulb = njit(cache=True, fastmath=True)(_cardioid_or_bulb_test)
+
+
+def _make_iterate_point(in_cardioid_or_bulb):
+    """
+    Return the plain Python escape time iteration, calling in_cardioid_or_bulb compiled for the same target
+
+    :param in_cardioid_or_bulb: compiled version of '_cardioid_or_bulb_test'
+    :return: function
+    """
+    def iterate_point(zr, zi, c_real, c_imag, max_it):
+        """
+        Return escape time of z = zr + i*zi under z^2 + c (max_it + 1 if it never escapes)
+        Shared by the Mandelbrot set (z starts at 0) and Julia sets (c is fixed)
+        An orbit only counts as periodic once it lands exactly on an earlier point, so the cycle check never changes
+        the result and the NumPy fallback gives the same answers without it
+
+        :param zr: float, real part of z_0
+        :param zi: float, imaginary part of z_0
+        :param c_real: float
+        :param c_imag: float
+        :param max_it: int
+        :return: int
+        """
+        if zr == 0 and zi == 0 and in_cardioid_or_bulb(c_real, c_imag): #orbit of 0 is known to never escape
+            return max_it + 1
+        zr2 = zr * zr
+        zi2 = zi * zi
+        zr_ref = zr #earlier point of the orbit, replaced by z_1 before it is first compared
+        zi_ref = zi
+        for k in range(max_it + 1): #Runs loop from 0 to max_it (inclusive)
+            zi = (zr + zr) * zi + c_imag #imaginary part of z^2 + c, zr + zr instead of 2 * zr keeps float32 in float32
+            zr = zr2 - zi2 + c_real #real part of z^2 + c
+            zr2 = zr * zr
+            zi2 = zi * zi
+            if zr2 + zi2 > 4.0: #|z|^2 > 4, avoids the sqrt in abs()
+                return k
+            if k % _PERIOD_CHECK_INTERVAL == 0:
+                zr_ref = zr
+                zi_ref = zi
+            elif zr == zr_ref and zi == zi_ref: #back at the reference point, the orbit repeats forever
+                return max_it + 1
+        return max_it + 1 #never escapes
+
+    return iterate_point
+
+
+_iterate_point = njit(cache=True, fastmath=True)(_make_iterate_point(_in_cardioid_or_bulb))
+
+
 def get_escape_time(c: complex, max_iterations: int) -> int | None:
     """
     Return number of iterations which pass before c escapes:
@@ -9,21 +111,20 @@ def get_escape_time(c: complex, max_iterations: int) -> int | None:
     :param max_iterations: int
     :return: int or None
     """
-    z = 0 #Iteration begins at z_0 = 0
-    for k in range(max_iterations+1): #Runs loop from 0 to max_iterations (inclusive)
-        z = z**2 + c
-        if abs(z) > 2: #If value escapes
-            return k
-    return None #If value never escapes
+    c = complex(c)
+    k = _iterate_point(0.0, 0.0, c.real, c.imag, max_iterations) #Iteration begins at z_0 = 0
+    return None if k > max_iterations else int(k)
 
-def get_complex_grid(top_left: complex, bottom_right: complex, step: float) -> np.ndarray:
+
+def get_complex_grid_parts(top_left: complex, bottom_right: complex, step: float) -> tuple[np.ndarray, np.ndarray]:
     """
-    Return an array of evenly spaced complex numbers between top_left and bottom_right (exclusive)
+    Return the real and imaginary parts of 'get_complex_grid' as a row of real parts and a column of imaginary parts,
+    which broadcast to the full grid without storing it
 
     :param top_left: complex number
     :param bottom_right: complex number
     :param step: float
-    :return: numpy array
+    :return: tuple of numpy arrays, shapes (1, n_cols) and (n_rows, 1)
     """
     #Setting bounds
     col_start = top_left.real #col = real numbers
@@ -34,55 +135,335 @@ def get_complex_grid(top_left: complex, bottom_right: complex, step: float) -> n
     real_range = np.arange(col_start, col_end, step) #range of real numbers
     imag_range = np.arange(row_start, row_end, -step) #range of imaginary numbers
 
-    real_arr, imag_arr = np.meshgrid(real_range, imag_range) #creates grid with both real and imaginary
-    return real_arr + 1j * imag_arr #Generated complex grid
+    return real_range[None, :], imag_range[:, None]
 
 
-def get_escape_time_color_arr(c_arr: np.ndarray, max_iterations: int) -> np.ndarray:
+def get_complex_grid(top_left: complex, bottom_right: complex, step: float) -> np.ndarray:
     """
-    Takes input of array of c-values, returns array of same shape with color values in [0,1] according to escape time of each c-value
+    Return an array of evenly spaced complex numbers between top_left and bottom_right (exclusive)
+
+    :param top_left: complex number
+    :param bottom_right: complex number
+    :param step: float
+    :return: numpy array
+    """
+    real_row, imag_col = get_complex_grid_parts(top_left, bottom_right, step)
+    complex_grid = np.empty((imag_col.shape[0], real_row.shape[1]), dtype=complex)
+    complex_grid.real = real_row #broadcasts each real part down its column
+    complex_grid.imag = imag_col #broadcasts each imaginary part along its row
+    return complex_grid #Generated complex grid
+
+
+#(float type, escape time type) combinations the gufunc is compiled for
+_GUFUNC_TYPES = [(real, escape) for real in ("float32", "float64") for escape in ("uint16", "int32", "int64")]
+
+
+@guvectorize([f"void({real}[:], {real}[:], {real}[:], {real}[:], int64, {escape}[:])"
+              for real, escape in _GUFUNC_TYPES],
+             "(n),(n),(n),(n),()->(n)", nopython=True, target="parallel", fastmath=True, cache=True)
+def _escape_gufunc(zr0, zi0, cr, ci, max_it, out):
+    """
+    Write the escape time of every point of a row under z^2 + c into out (max_it + 1 if it never escapes)
+    Called on 2D arrays, NumPy broadcasting hands each row to a separate thread. Rows of a constant z_0 (Mandelbrot)
+    or a constant c (Julia) can be zero-stride views from np.broadcast_to
+
+    :param zr0: 1D float array, real parts of z_0
+    :param zi0: 1D float array, imaginary parts of z_0
+    :param cr: 1D float array, real parts of c
+    :param ci: 1D float array, imaginary parts of c
+    :param max_it: int
+    :param out: 1D int array, same length as zr0
+    """
+    for col in range(zr0.shape[0]):
+        out[col] = _iterate_point(zr0[col], zi0[col], cr[col], ci[col], max_it)
+
+
+if _HAS_CUDA:
+    #the same iteration and cardioid test compiled as device functions
+    _in_cardioid_or_bulb_device = cuda.jit(device=True)(_cardioid_or_bulb_test)
+    _iterate_point_device = cuda.jit(device=True)(_make_iterate_point(_in_cardioid_or_bulb_device))
+
+    @cuda.jit
+    def _mandel_cuda_kernel(cr, ci, zero, max_it, out):
+        """
+        Write the escape time of c = cr[y, x] + i*ci[y, x] into out[y, x] for the pixel handled by this thread
+
+        :param zero: 0 of the float type of cr, z_0 of every point
+        """
+        x, y = cuda.grid(2)
+        if x < out.shape[1] and y < out.shape[0]: #thread is inside the grid
+            out[y, x] = _iterate_point_device(zero, zero, cr[y, x], ci[y, x], max_it)
+
+    @cuda.jit
+    def _julia_cuda_kernel(zr0, zi0, c_real, c_imag, max_it, out):
+        """
+        Write the escape time of z_0 = zr0[y, x] + i*zi0[y, x] under z^2 + c into out[y, x] for the pixel handled by
+        this thread
+        """
+        x, y = cuda.grid(2)
+        if x < out.shape[1] and y < out.shape[0]:
+            out[y, x] = _iterate_point_device(zr0[y, x], zi0[y, x], c_real, c_imag, max_it)
+
+
+def _use_cuda(arr: np.ndarray) -> bool:
+    """
+    Return whether arr is a 2D grid big enough to be computed on the GPU
+
+    :param arr: numpy array
+    :return: bool
+    """
+    return _HAS_CUDA and arr.ndim == 2 and arr.size >= _CUDA_MIN_PIXELS
+
+
+def _run_cuda_kernel(kernel, dtype: type, *args) -> np.ndarray:
+    """
+    Launch kernel with one thread per pixel of the 2D grid args[0] and return the escape times
+
+    :param kernel: the CUDA escape time kernel
+    :param dtype: integer dtype of the escape times
+    :param args: kernel arguments without out, numpy arrays are copied to the GPU and scalars passed as is
+    :return: numpy array of escape times
+    """
+    height, width = args[0].shape
+    device_args = [cuda.to_device(np.ascontiguousarray(arg)) if isinstance(arg, np.ndarray) else arg for arg in args]
+    out = cuda.device_array((height, width), dtype=dtype)
+    blocks = ((width + _CUDA_BLOCK - 1) // _CUDA_BLOCK, (height + _CUDA_BLOCK - 1) // _CUDA_BLOCK)
+    kernel[blocks, (_CUDA_BLOCK, _CUDA_BLOCK)](*device_args, out)
+    return out.copy_to_host()
+
 
-    :param c_arr: array of complex numbers
+def _as_rows(arr: np.ndarray) -> np.ndarray:
+    """
+    Return arr as a 2D array whose rows are the last axis of arr, for the row-parallel kernels
+    A 1D array becomes a column so its points are still spread over threads
+
+    :param arr: numpy array
+    :return: numpy array
+    """
+    if arr.ndim < 2:
+        return arr.reshape(arr.size, 1)
+    return arr.reshape(math.prod(arr.shape[:-1]), arr.shape[-1]) #explicit size, -1 is ambiguous for empty grids
+
+
+def _gufunc_signature(gufunc, escape_times: np.ndarray) -> tuple:
+    """
+    Return the signature argument that makes gufunc use the loop for escape_times' dtype
+    NumPy picks the loop from the input types only, so an int32 output could otherwise get the uint16 loop and wrap
+
+    :param gufunc: the escape time gufunc
+    :param escape_times: preallocated output array
+    :return: tuple of dtypes, None for the inputs NumPy should resolve
+    """
+    return (None,) * gufunc.nin + (escape_times.dtype,)
+
+
+def _escape_time_dtype(max_iterations: int) -> type:
+    """
+    Return the smallest integer dtype that holds escape times up to max_iterations + 1
+
+    :param max_iterations: int
+    :return: numpy integer type
+    """
+    for dtype in (np.uint16, np.int32):
+        if max_iterations + 1 <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _escape_times_to_colors(escape_times: np.ndarray, max_iterations: int) -> np.ndarray:
+    """
+    Convert escape times to color values in [0,1], points that never escape have escape time max_iterations + 1
+
+    :param escape_times: numpy array of ints
+    :param max_iterations: int
+    :return: float32 numpy array
+    """
+    inverse = np.float32(1.0 / (max_iterations + 1)) #multiply instead of dividing every pixel
+    colors = np.subtract(max_iterations + 1, escape_times, dtype=np.float32) #single float32 allocation
+    colors *= inverse
+    return colors
+
+
+def _float_dtype(dtype) -> np.dtype:
+    """
+    Return dtype as a numpy dtype, the kernels are only compiled for float32 and float64
+
+    :param dtype: float type, numpy dtype or dtype name
+    :return: numpy dtype
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"dtype must be float32 or float64, got {dtype}")
+    return dtype
+
+
+def _split_grid(grid, dtype: np.dtype) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the real and imaginary parts of grid as two float arrays of the same shape (possibly non-contiguous views)
+
+    :param grid: complex array or (real, imaginary) pair of float arrays that broadcast together
+    :param dtype: float dtype of the returned arrays
+    :return: tuple of numpy arrays
+    """
+    if isinstance(grid, tuple):
+        return tuple(np.broadcast_arrays(np.asarray(grid[0], dtype=dtype), np.asarray(grid[1], dtype=dtype)))
+    grid = np.asarray(grid, dtype=complex)
+    return grid.real.astype(dtype, copy=False), grid.imag.astype(dtype, copy=False)
+
+
+def _escape_times_numpy(zr: np.ndarray, zi: np.ndarray, cr: np.ndarray, ci: np.ndarray,
+                        max_iterations: int) -> np.ndarray:
+    """
+    Iterate z = z^2 + c with NumPy on flat float arrays, return escape time of each point (max_iterations + 1 if it never escapes)
+    Points are processed in tiles that stay in cache for every iteration instead of streaming the whole grid per iteration
+
+    :param zr: 1D float array, real parts of z_0 (overwritten)
+    :param zi: 1D float array, imaginary parts of z_0 (overwritten)
+    :param cr: 1D float array, real parts of c
+    :param ci: 1D float array, imaginary parts of c
     :param max_iterations: int
     :return: numpy array
     """
-    #make zero array and the other supporting arrays
-    zeros = np.zeros_like(c_arr, dtype=complex)
-    escape_times = np.full(c_arr.shape, max_iterations + 1, dtype=int)
-    mask = np.ones(c_arr.shape, dtype=bool)
+    escape_times = np.empty(zr.shape, dtype=_escape_time_dtype(max_iterations))
+    for start in range(0, zr.size, _TILE_SIZE):
+        tile = slice(start, start + _TILE_SIZE)
+        escape_times[tile] = _escape_times_numpy_tile(zr[tile], zi[tile], cr[tile], ci[tile], max_iterations)
+    return escape_times
+
+
+def _escape_times_numpy_tile(zr: np.ndarray, zi: np.ndarray, cr: np.ndarray, ci: np.ndarray,
+                             max_iterations: int) -> np.ndarray:
+    """
+    Iterate z = z^2 + c with NumPy on one tile of flat float arrays, return escape time of each point
+
+    :param zr: 1D float array, real parts of z_0 (overwritten)
+    :param zi: 1D float array, imaginary parts of z_0 (overwritten)
+    :param cr: 1D float array, real parts of c
+    :param ci: 1D float array, imaginary parts of c
+    :param max_iterations: int
+    :return: numpy array
+    """
+    zr2 = zr * zr #zr squared
+    zi2 = zi * zi #zi squared
+    escape_times = np.full(zr.shape, max_iterations + 1, dtype=_escape_time_dtype(max_iterations))
+    idx = np.arange(zr.size) #position in escape_times of each point still being iterated
+
+    #scratch buffers, only reallocated when the working arrays are compacted
+    zrzi = np.empty_like(zr)
+    mag2 = np.empty_like(zr) #|z|^2
+    escaped = np.empty(zr.shape, dtype=bool)
+    newly_escaped = np.empty(zr.shape, dtype=bool)
+    still_in = np.ones(zr.shape, dtype=bool) #points that haven't escaped yet
 
     for i in range(max_iterations + 1):
-        zeros[mask] = zeros[mask] ** 2 + c_arr[mask]  #apply the mandelbrot iteration
-        newly_escaped = mask & (np.abs(zeros) > 2 )  #find newly escaped points
-        escape_times[newly_escaped] = i  #set escape times for new points
-        mask[newly_escaped] = False  #get rid of the points
+        #z = z^2 + c, updated in place on every tracked point
+        np.multiply(zr, zi, out=zrzi)
+        np.add(zrzi, zrzi, out=zi) #2*zr*zi without a multiply by a broadcast scalar
+        np.add(zi, ci, out=zi)
+        np.subtract(zr2, zi2, out=zr)
+        np.add(zr, cr, out=zr)
+        np.multiply(zr, zr, out=zr2)
+        np.multiply(zi, zi, out=zi2)
+        np.add(zr2, zi2, out=mag2)
+        np.greater(mag2, 4.0, out=escaped)  #|z| > 2 without the sqrt
+
+        np.logical_and(still_in, escaped, out=newly_escaped)  #find newly escaped points
+        np.not_equal(still_in, newly_escaped, out=still_in)  #newly escaped points are a subset of still_in
+        escape_times[idx[newly_escaped]] = i  #set escape times for new points
+
+        #reset escaped points to 0 so they can't overflow
+        for arr in (zr, zi, zr2, zi2):
+            np.copyto(arr, 0.0, where=escaped)
 
-    #normalize
-    colors = (max_iterations - escape_times + 1) / (max_iterations + 1)
-    return colors.astype(float)
+        if i % _ACTIVE_CHECK_INTERVAL == _ACTIVE_CHECK_INTERVAL - 1:
+            active = np.count_nonzero(still_in)
+            if active == 0: #every point has escaped
+                break
+            if active < _COMPACT_FRACTION * idx.size: #only keep iterating the points that are left
+                idx = idx[still_in]
+                cr, ci, zr, zi, zr2, zi2 = (arr[still_in] for arr in (cr, ci, zr, zi, zr2, zi2))
+                zrzi = np.empty_like(zr)
+                mag2 = np.empty_like(zr)
+                escaped = np.empty(zr.shape, dtype=bool)
+                newly_escaped = np.empty(zr.shape, dtype=bool)
+                still_in = np.ones(zr.shape, dtype=bool)
 
+    return escape_times
 
-def get_julia_color_arr(grid: np.ndarray, c: complex, max_iterations: int) -> np.ndarray:
+
+def get_escape_time_color_arr(c_arr: np.ndarray | tuple[np.ndarray, np.ndarray], max_iterations: int,
+                              dtype: type = np.float64) -> np.ndarray:
+    """
+    Takes input of array of c-values, returns array of same shape with color values in [0,1] according to escape time of each c-value
+
+    :param c_arr: array of complex numbers, or (real, imaginary) pair from 'get_complex_grid_parts'
+    :param max_iterations: int
+    :param dtype: np.float32 or np.float64, np.float32 only speeds up the NumPy fallback and loses accuracy on deep zooms
+    :return: float32 numpy array
+    """
+    dtype = _float_dtype(dtype)
+    cr, ci = _split_grid(c_arr, dtype)
+    time_dtype = _escape_time_dtype(max_iterations)
+    zeros = np.broadcast_to(np.zeros((), dtype=dtype), cr.shape) #z starts at 0 for every point
+    if _use_cuda(cr):
+        escape_times = _run_cuda_kernel(_mandel_cuda_kernel, time_dtype, cr, ci, dtype.type(0), max_iterations)
+        return _escape_times_to_colors(escape_times, max_iterations)
+
+    escape_times = np.empty(_as_rows(cr).shape, dtype=time_dtype)
+    if _HAS_CYTHON_KERNEL: #compiled ahead of time, no JIT warmup
+        mandel_kernel.mandelbrot(np.ascontiguousarray(_as_rows(cr)), np.ascontiguousarray(_as_rows(ci)), max_iterations,
+                                 escape_times)
+        return _escape_times_to_colors(escape_times.reshape(cr.shape), max_iterations)
+
+    if _HAS_NUMBA:
+        _escape_gufunc(_as_rows(zeros), _as_rows(zeros), _as_rows(cr), _as_rows(ci), max_iterations, escape_times,
+                       signature=_gufunc_signature(_escape_gufunc, escape_times))
+        return _escape_times_to_colors(escape_times.reshape(cr.shape), max_iterations)
+
+    #only iterate points outside the main cardioid and period-2 bulb, z starts at 0
+    escape_times = np.full(cr.shape, max_iterations + 1, dtype=time_dtype)
+    outside = ~np.asarray(_in_cardioid_or_bulb(cr, ci)) #stays an array for 0D grids
+    n_outside = np.count_nonzero(outside)
+    escape_times[outside] = _escape_times_numpy(np.zeros(n_outside, dtype=dtype), np.zeros(n_outside, dtype=dtype),
+                                                cr[outside], ci[outside], max_iterations)
+    return _escape_times_to_colors(escape_times, max_iterations)
+
+
+def get_julia_color_arr(grid: np.ndarray | tuple[np.ndarray, np.ndarray], c: complex,
+                        max_iterations: int, dtype: type = np.float64) -> np.ndarray:
     """
     Collects escape data for filled in Julia set for given complex number c
     Converts grid to a color according to implementation of 'get_escape_time_color_arr'
 
-    :param grid: complex grid
+    :param grid: complex grid, or (real, imaginary) pair from 'get_complex_grid_parts'
     :param c: complex number
     :param max_iterations: int
-    :return: numpy array
+    :param dtype: np.float32 or np.float64, np.float32 only speeds up the NumPy fallback and loses accuracy on deep zooms
+    :return: float32 numpy array
     """
+    dtype = _float_dtype(dtype)
+    zr0, zi0 = _split_grid(grid, dtype)
+    c_real = dtype.type(complex(c).real)
+    c_imag = dtype.type(complex(c).imag)
+    time_dtype = _escape_time_dtype(max_iterations)
+    cr = np.broadcast_to(c_real, zr0.shape) #c is the same for every point
+    ci = np.broadcast_to(c_imag, zr0.shape)
+    if _use_cuda(zr0):
+        escape_times = _run_cuda_kernel(_julia_cuda_kernel, time_dtype, zr0, zi0, c_real, c_imag, max_iterations)
+        return _escape_times_to_colors(escape_times, max_iterations)
 
-    z = np.copy(grid) #Grid for testing Julia set
-    escape_times = np.full(grid.shape, max_iterations + 1, dtype=int)
-    mask = np.ones(grid.shape, dtype=bool) #Tracks if points still in set
+    escape_times = np.empty(_as_rows(zr0).shape, dtype=time_dtype)
+    if _HAS_CYTHON_KERNEL:
+        mandel_kernel.julia(np.ascontiguousarray(_as_rows(zr0)), np.ascontiguousarray(_as_rows(zi0)), c_real, c_imag,
+                            max_iterations, escape_times)
+        return _escape_times_to_colors(escape_times.reshape(zr0.shape), max_iterations)
 
-    for i in range(max_iterations + 1):
-        z[mask] = z[mask] ** 2 + c #z = z^2 + c
-        newly_escaped = mask & (np.abs(z) > 2) #checks final escapes
-        escape_times[newly_escaped] = i #iteration count
-        mask[newly_escaped] = False # remove points
-
-    #normalize
-    colors = (max_iterations - escape_times + 1) / (max_iterations + 1)
-    return colors.astype(float)
\ No newline at end of file
+    if _HAS_NUMBA:
+        _escape_gufunc(_as_rows(zr0), _as_rows(zi0), _as_rows(cr), _as_rows(ci), max_iterations, escape_times,
+                       signature=_gufunc_signature(_escape_gufunc, escape_times))
+        return _escape_times_to_colors(escape_times.reshape(zr0.shape), max_iterations)
+
+    #z starts at the grid point
+    escape_times = _escape_times_numpy(zr0.ravel().copy(), zi0.ravel().copy(), cr.ravel(), ci.ravel(),
+                                       max_iterations)
+    return _escape_times_to_colors(escape_times.reshape(zr0.shape), max_iterations)